@@ -13,10 +13,16 @@ import sys
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
 
 from edi271_parser import (
-    EligibilityResponse, 
-    SimpleEDI271Parser, 
+    EligibilityResponse,
+    SimpleEDI271Parser,
     DatabaseManager,
-    PSYCOPG2_AVAILABLE
+    PSYCOPG2_AVAILABLE,
+    ingest_pipeline,
+    parse_directory,
+    parse_many,
+    _copy_escape,
+    _FIELD_NAMES,
+    _INSERT_COLUMNS,
 )
 
 # Sample EDI 271 content for testing
@@ -169,14 +175,27 @@ SE*3*TEST456~"""
         result2 = parser2.parse_content(test_edi_98)
         assert result2.preventative_care_copay == "$15.00"
 
+class TestCopyEscape:
+    def test_plain_value_unchanged(self):
+        assert _copy_escape("BLUE CROSS BLUE SHIELD") == "BLUE CROSS BLUE SHIELD"
+
+    def test_none_becomes_null_marker(self):
+        assert _copy_escape(None) == "\\N"
+
+    def test_special_characters_escaped(self):
+        assert _copy_escape("a\\b") == "a\\\\b"
+        assert _copy_escape("a\tb") == "a\\tb"
+        assert _copy_escape("a\nb") == "a\\nb"
+        assert _copy_escape("a\rb") == "a\\rb"
+
 @pytest.mark.skipif(not PSYCOPG2_AVAILABLE, reason="psycopg2 not available")
 class TestDatabaseManager:
     def test_database_manager_initialization_without_psycopg2(self):
         with patch('edi271_parser.PSYCOPG2_AVAILABLE', False):
             with pytest.raises(ImportError):
-                DatabaseManager({"host": "localhost"})
+                DatabaseManager({"host": "localhost"}, driver="psycopg2")
     
-    @patch('edi271_parser.psycopg2.pool.ThreadedConnectionPool')
+    @patch('psycopg2.pool.ThreadedConnectionPool')
     def test_initialize_pool(self, mock_pool):
         config = {
             "host": "localhost",
@@ -186,12 +205,12 @@ class TestDatabaseManager:
             "password": "test_password"
         }
         
-        db_manager = DatabaseManager(config)
+        db_manager = DatabaseManager(config, driver="psycopg2")
         db_manager.initialize_pool()
         
         mock_pool.assert_called_once_with(1, 10, **config)
     
-    @patch('edi271_parser.psycopg2.pool.ThreadedConnectionPool')
+    @patch('psycopg2.pool.ThreadedConnectionPool')
     def test_get_connection_context_manager(self, mock_pool):
         mock_conn = Mock()
         mock_pool_instance = Mock()
@@ -199,18 +218,99 @@ class TestDatabaseManager:
         mock_pool.return_value = mock_pool_instance
         
         config = {"host": "localhost", "database": "test_db"}
-        db_manager = DatabaseManager(config)
+        db_manager = DatabaseManager(config, driver="psycopg2")
         
         with db_manager.get_connection() as conn:
             assert conn is mock_conn
         
         mock_pool_instance.putconn.assert_called_once_with(mock_conn)
     
+    @patch('psycopg2.pool.ThreadedConnectionPool')
+    def test_insert_many_copy_buffer(self, mock_pool):
+        mock_conn = MagicMock()
+        mock_pool.return_value.getconn.return_value = mock_conn
+        mock_cursor = mock_conn.cursor.return_value.__enter__.return_value
+
+        db_manager = DatabaseManager({"host": "localhost"}, driver="psycopg2")
+        response = EligibilityResponse(
+            transaction_id="TX\t1",
+            payer_name="PAYER\\CO",
+            address="123 MAIN ST\nSUITE 4",
+            response_date="01/15/2024",
+        )
+        count = db_manager.insert_many([response])
+
+        assert count == 1
+        copy_sql, buf = mock_cursor.copy_expert.call_args[0]
+        assert copy_sql.startswith("COPY eligibility_responses")
+        lines = buf.getvalue().splitlines()
+        assert len(lines) == 1
+        row = dict(zip(_INSERT_COLUMNS, lines[0].split("\t")))
+        assert len(row) == len(_INSERT_COLUMNS)
+        assert row["transaction_id"] == "TX\\t1"
+        assert row["payer_name"] == "PAYER\\\\CO"
+        assert row["address"] == "123 MAIN ST\\nSUITE 4"
+        assert row["response_date"] == "2024-01-15"
+        # Empty dates become SQL NULL, not empty strings
+        assert row["date_of_birth"] == "\\N"
+        mock_conn.commit.assert_called_once()
+
+    @patch('psycopg2.pool.ThreadedConnectionPool')
+    def test_insert_batch_row_shape(self, mock_pool):
+        mock_conn = MagicMock()
+        mock_pool.return_value.getconn.return_value = mock_conn
+        mock_cursor = mock_conn.cursor.return_value.__enter__.return_value
+
+        db_manager = DatabaseManager({"host": "localhost"}, driver="psycopg2")
+        responses = [
+            EligibilityResponse(transaction_id="TX1"),
+            EligibilityResponse(transaction_id="TX2"),
+        ]
+        with patch('edi271_parser.execute_values') as mock_ev:
+            count = db_manager.insert_batch(responses)
+
+        assert count == 2
+        cursor_arg, _, rows = mock_ev.call_args[0]
+        assert cursor_arg is mock_cursor
+        assert len(rows) == 2
+        assert all(len(row) == len(_INSERT_COLUMNS) for row in rows)
+        assert rows[0][0] == "TX1"
+        mock_conn.commit.assert_called_once()
+
+    @patch('psycopg2.pool.ThreadedConnectionPool')
+    def test_insert_without_return_id(self, mock_pool):
+        mock_conn = MagicMock()
+        mock_pool.return_value.getconn.return_value = mock_conn
+        mock_cursor = mock_conn.cursor.return_value.__enter__.return_value
+
+        db_manager = DatabaseManager({"host": "localhost"}, driver="psycopg2")
+        record_id = db_manager.insert_eligibility_response(
+            EligibilityResponse(transaction_id="TX1"), return_id=False
+        )
+
+        assert record_id == 0
+        insert_sql = mock_cursor.execute.call_args[0][0]
+        assert "RETURNING" not in insert_sql
+        mock_cursor.fetchone.assert_not_called()
+
+    @patch('psycopg2.pool.ThreadedConnectionPool')
+    def test_batch_session_commits_once(self, mock_pool):
+        mock_conn = MagicMock()
+        mock_pool.return_value.getconn.return_value = mock_conn
+
+        db_manager = DatabaseManager({"host": "localhost"}, driver="psycopg2")
+        with db_manager.batch_session() as cursor:
+            cursor.execute("SELECT 1")
+            cursor.execute("SELECT 2")
+
+        mock_conn.commit.assert_called_once()
+        mock_pool.return_value.putconn.assert_called_once_with(mock_conn)
+
     def test_parse_date_valid_formats(self):
         config = {"host": "localhost"}
         
         with patch('edi271_parser.PSYCOPG2_AVAILABLE', True):
-            db_manager = DatabaseManager(config)
+            db_manager = DatabaseManager(config, driver="psycopg2")
             
             # Test MM/DD/YYYY format
             assert db_manager._parse_date("01/15/2024") == "2024-01-15"
@@ -223,6 +323,77 @@ class TestDatabaseManager:
             # Test invalid format
             assert db_manager._parse_date("invalid-date") == "invalid-date"
 
+class TestBulkIngestion:
+    def _write_sample_files(self, tmp_dir, count):
+        """Write sample EDI files with distinct transaction ids."""
+        paths = []
+        for i in range(count):
+            path = os.path.join(tmp_dir, f"file_{i:03d}.edi")
+            with open(path, 'w') as f:
+                f.write(SAMPLE_EDI_271.replace(
+                    "ST*271*1234567890~", f"ST*271*TX{i:03d}~"))
+            paths.append(path)
+        return paths
+
+    def _recording_db(self, batches):
+        """Mock DatabaseManager whose insert_many records batch copies."""
+        mock_db = Mock(spec=DatabaseManager)
+
+        def record(records, cursor=None):
+            batches.append(list(records))
+            return len(records)
+
+        mock_db.insert_many.side_effect = record
+        return mock_db
+
+    def test_ingest_pipeline_inserts_each_record_once(self):
+        batches = []
+        mock_db = self._recording_db(batches)
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            paths = self._write_sample_files(tmp_dir, 10)
+            inserted = ingest_pipeline(paths, mock_db,
+                                       parse_threads=2, batch_size=3)
+
+        assert inserted == 10
+        assert all(len(batch) <= 3 for batch in batches)
+        transaction_ids = [record.transaction_id
+                           for batch in batches for record in batch]
+        assert sorted(transaction_ids) == [f"TX{i:03d}" for i in range(10)]
+
+    def test_ingest_pipeline_empty_input(self):
+        mock_db = Mock(spec=DatabaseManager)
+        assert ingest_pipeline([], mock_db, parse_threads=2) == 0
+        mock_db.insert_many.assert_not_called()
+
+    def test_parse_directory_without_db(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            self._write_sample_files(tmp_dir, 3)
+            assert parse_directory(tmp_dir) == 3
+
+    def test_parse_directory_flushes_batches(self):
+        batches = []
+        mock_db = self._recording_db(batches)
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            self._write_sample_files(tmp_dir, 5)
+            count = parse_directory(tmp_dir, mock_db, flush_every=2)
+
+        assert count == 5
+        assert all(len(batch) <= 2 for batch in batches)
+        transaction_ids = [record.transaction_id
+                           for batch in batches for record in batch]
+        assert sorted(transaction_ids) == [f"TX{i:03d}" for i in range(5)]
+
+    def test_parse_many_returns_columns(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            paths = self._write_sample_files(tmp_dir, 3)
+            columns = parse_many(paths)
+
+        assert set(columns) == set(_FIELD_NAMES)
+        assert columns['transaction_id'] == ["TX000", "TX001", "TX002"]
+        assert columns['member_id'] == ["123456789"] * 3
+
 class TestIntegration:
     def test_parser_without_database_integration(self):
         """Test that parser works without any database configuration"""
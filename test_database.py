@@ -65,6 +65,33 @@ def test_database_connection(config):
             print("❌ Failed to retrieve data")
             return False
         
+        # Test bulk insert paths
+        print("Testing bulk insertion (COPY)...")
+        bulk_copy = [
+            EligibilityResponse(
+                transaction_id=f"TEST_COPY_{i}",
+                payer_name="Test Insurance",
+                subscriber_name=f"Test, Copy{i}",
+                member_id=f"TEST_MEMBER_COPY_{i}",
+            )
+            for i in range(50)
+        ]
+        inserted = db_manager.insert_many(bulk_copy)
+        print(f"✅ Bulk COPY inserted {inserted} records")
+
+        print("Testing batched insertion...")
+        bulk_batch = [
+            EligibilityResponse(
+                transaction_id=f"TEST_BATCH_{i}",
+                payer_name="Test Insurance",
+                subscriber_name=f"Test, Batch{i}",
+                member_id=f"TEST_MEMBER_BATCH_{i}",
+            )
+            for i in range(50)
+        ]
+        inserted = db_manager.insert_batch(bulk_batch)
+        print(f"✅ Batched insert wrote {inserted} records")
+
         # Test status update
         print("Testing status update...")
         success = db_manager.update_eligibility_status(record_id, "Inactive")